@@ -13,16 +13,30 @@ Optional (defaults used if not set):
 - DB_PORT:     5432
 """
 
+import functools
 import os
 from dotenv import load_dotenv
 
-# Load variables from .env file
-load_dotenv()
 
-DB_CONFIG = {
-    "dbname": os.getenv("DB_NAME", "supply_chain_sim"),
-    "user": os.getenv("DB_USER"),
-    "password": os.getenv("DB_PASS"),
-    "host": os.getenv("DB_HOST", "localhost"),
-    "port": int(os.getenv("DB_PORT", 5432)),
-}
+@functools.lru_cache(maxsize=1)
+def _load_config():
+    """
+    Parses the .env file and builds the connection settings dictionary.
+
+    Cached so the .env file is opened and parsed at most once per process,
+    even if this is called again (e.g. from simulation worker setup).
+
+    Returns:
+        dict: psycopg2 connection keyword arguments.
+    """
+    load_dotenv()
+    return {
+        "dbname": os.getenv("DB_NAME", "supply_chain_sim"),
+        "user": os.getenv("DB_USER"),
+        "password": os.getenv("DB_PASS"),
+        "host": os.getenv("DB_HOST", "localhost"),
+        "port": int(os.getenv("DB_PORT", 5432)),
+    }
+
+
+DB_CONFIG = _load_config()
@@ -6,11 +6,23 @@ It also maps suppliers to items by matching product categories.
 """
 
 import random
+import time
+import numpy as np
 from faker import Faker
 from datetime import datetime
-from models import *
-import json
+from models import Supplier, Item, Customer, SupplierTable, ItemTable
+import hashlib
+import orjson
 import os
+import pickle
+
+# Nanoseconds per simulation tick (one minute).
+TICK_NS = 60 * 1_000_000_000
+
+# Entity counts produced by a full generation run.
+N_SUPPLIERS = 10
+N_ITEMS = 50
+N_CUSTOMERS = 200
 
 
 class DataGenerator:
@@ -21,12 +33,58 @@ class DataGenerator:
         suppliers (dict[int, Supplier]): Mapping of supplier IDs to Supplier objects.
         items (dict[int, Item]): Mapping of item IDs to Item objects.
         customers (dict[int, Customer]): Mapping of customer IDs to Customer objects.
-        supplier_items (dict[int, list[int]]): Maps supplier IDs to item IDs they can supply.
-        sim_time (datetime): Starting timestamp for the simulation.
+        supplier_items (dict[int, np.ndarray]): Maps supplier IDs to int32 arrays of
+            item IDs they can supply.
+        item_suppliers (dict[int, list[int]]): Inverse mapping of item IDs to supplier IDs.
+        cat_sampling (dict[str, tuple[list[int], list[float]]]): Per-category supplier IDs
+            with cumulative fulfillment weights, ready for random.choices(cum_weights=...).
+        item_restock_sampling (tuple[list[int], list[float]]): Item IDs with cumulative
+            restock weights for weighted restock draws.
+        supplier_table (SupplierTable): Column-oriented view of the suppliers.
+        item_table (ItemTable): Column-oriented view of the items.
+        sim_epoch_ns (int): Simulation start as integer epoch nanoseconds.
+        sim_tick (int): Tick counter added on top of the epoch.
+        sim_time (datetime): Starting timestamp derived from the counters.
         fake (Faker): Faker instance for generating random names and words.
+        rng (random.Random): Seeded per-instance RNG for scalar draws.
+        nrng (np.random.Generator): Seeded per-instance NumPy RNG for bulk draws.
     """
 
-    def __init__(self):
+    __slots__ = (
+        "suppliers",
+        "items",
+        "customers",
+        "supplier_items",
+        "item_suppliers",
+        "cat_sampling",
+        "item_restock_sampling",
+        "supplier_table",
+        "item_table",
+        "sim_epoch_ns",
+        "sim_tick",
+        "fake",
+        "seed",
+        "rng",
+        "nrng",
+    )
+
+    suppliers: dict[int, Supplier]
+    items: dict[int, Item]
+    customers: dict[int, Customer]
+    supplier_items: dict[int, np.ndarray]
+    item_suppliers: dict[int, list[int]]
+    cat_sampling: dict[str, tuple[list[int], list[float]]]
+    item_restock_sampling: tuple[list[int], list[float]]
+    supplier_table: SupplierTable
+    item_table: ItemTable
+    sim_epoch_ns: int
+    sim_tick: int
+    fake: Faker
+    seed: int
+    rng: random.Random
+    nrng: np.random.Generator
+
+    def __init__(self) -> None:
         """
         Initialises the data generator.
 
@@ -37,75 +95,110 @@ class DataGenerator:
         self.items = {}
         self.customers = {}
         self.supplier_items = {}
-        self.sim_time = datetime.now()
+        self.item_suppliers = {}
+        self.sim_epoch_ns = time.time_ns()
+        self.sim_tick = 0
         self.fake = Faker()
         self.seed = 42
-        random.seed(self.seed)
+        self.fake.seed_instance(self.seed)
+        self.rng = random.Random(self.seed)
+        self.nrng = np.random.default_rng(self.seed)
 
-    def generate_suppliers(self):
+    @property
+    def sim_time(self) -> datetime:
         """
-        Generates 10 suppliers, each assigned to one of 5 predefined categories.
+        datetime: Simulation start timestamp derived from the tick counter.
 
-        Returns:
-            set[str]: A set of used categories.
+        Internally time is kept as an integer nanosecond epoch plus a tick
+        count, so advancing it is plain integer arithmetic; the datetime
+        object is only materialised here on demand.
         """
-        categories = ["Electronics", "Clothing", "Food", "Medical", "Hardware"]
-        used_categories = set()
+        return datetime.fromtimestamp(
+            (self.sim_epoch_ns + self.sim_tick * TICK_NS) / 1e9
+        )
 
-        for i in range(1, 11):
-            category = categories[i % len(categories)]
-            used_categories.add(category)
-            self.suppliers[i] = Supplier(
-                id=i,
-                name=self.fake.company(),
-                category=category,
-                max_quantity=40,
-                failure_rate=round(random.uniform(0.01, 0.5), 2),
-                fulfillment_weight=round(random.uniform(0.1, 6.0), 2),
+    def _build_sampling_tables(self, cat_to_sids: dict[str, list[int]]) -> None:
+        """
+        Builds the column tables and cumulative-weight sampling structures.
+
+        Args:
+            cat_to_sids (dict[str, list[int]]): Supplier IDs bucketed by category.
+        """
+        self.supplier_table = SupplierTable(self.suppliers.values())
+        self.item_table = ItemTable(self.items.values())
+        self.cat_sampling = {
+            cat: (
+                sids,
+                np.cumsum(
+                    [self.suppliers[sid].fulfillment_weight for sid in sids]
+                ).tolist(),
             )
+            for cat, sids in cat_to_sids.items()
+        }
+        self.item_restock_sampling = (
+            self.item_table.ids.tolist(),
+            np.cumsum(self.item_table.restock_weights).tolist(),
+        )
 
-        return used_categories
+    def _build_derived(self) -> None:
+        """
+        Rebuilds the supplier-item mappings and sampling tables from the
+        entity dicts, e.g. after they were loaded from the pickle cache.
+        """
+        cat_to_sids = {}
+        for sid, supplier in self.suppliers.items():
+            cat_to_sids.setdefault(supplier.category, []).append(sid)
+
+        buckets = {sid: [] for sid in self.suppliers}
+        self.item_suppliers = {}
+        for item in self.items.values():
+            sids = cat_to_sids.get(item.category, [])
+            self.item_suppliers[item.id] = list(sids)
+            for sid in sids:
+                buckets[sid].append(item.id)
+        self.supplier_items = {
+            sid: np.asarray(iids, dtype=np.int32) for sid, iids in buckets.items()
+        }
 
-    def generate_items(self, used_categories):
+        self._build_sampling_tables(cat_to_sids)
+
+    def suppliers_tsv(self) -> str:
         """
-        Generates 50 items distributed across the given categories.
+        Returns the suppliers as tab-separated lines shaped for COPY FROM STDIN.
 
-        Args:
-            used_categories (set[str]): Categories to assign to items.
+        Returns:
+            str: One `id\\tname\\tcategory` line per supplier.
         """
-        for i in range(1, 51):
-            category = random.choice(list(used_categories))
-            self.items[i] = Item(
-                id=i,
-                name=self.fake.unique.word().title(),
-                category=category,
-                unit_price=round(random.uniform(5.00, 50.00), 2),
-                failure_rate=round(random.uniform(0.01, 0.5), 2),
-                restock_weight=round(random.uniform(0.1, 6.0), 2),
-            )
+        return "\n".join(
+            f"{s.id}\t{s.name}\t{s.category}" for s in self.suppliers.values()
+        )
 
-    def generate_customers(self):
+    def items_tsv(self) -> str:
         """
-        Generates 200 customers, randomly assigning them to one of four regions.
+        Returns the items as tab-separated lines shaped for COPY FROM STDIN.
+
+        Returns:
+            str: One `id\\tname\\tcategory\\tunit_price` line per item.
         """
-        regions = ["North", "South", "East", "West"]
-        for i in range(1, 201):
-            self.customers[i] = Customer(
-                id=i, name=self.fake.name(), region=random.choice(regions)
-            )
+        return "\n".join(
+            f"{i.id}\t{i.name}\t{i.category}\t{i.unit_price}"
+            for i in self.items.values()
+        )
 
-    def map_supplier_items(self):
+    def customers_tsv(self) -> str:
         """
-        Creates a mapping between suppliers and the item IDs they can supply,
-        based on matching categories.
+        Returns the customers as tab-separated lines shaped for COPY FROM STDIN.
+
+        Returns:
+            str: One `id\\tname\\tregion` line per customer.
         """
-        self.supplier_items = {sid: [] for sid in self.suppliers}
-        for item in self.items.values():
-            for sid, supplier in self.suppliers.items():
-                if item.category == supplier.category:
-                    self.supplier_items[sid].append(item.id)
+        return "\n".join(
+            f"{c.id}\t{c.name}\t{c.region}" for c in self.customers.values()
+        )
 
-    def export_config(self, output_dir="data", filename="simulation_config.json"):
+    def export_config(
+        self, output_dir: str = "data", filename: str = "simulation_config.json"
+    ) -> None:
         """
         Exports the current simulation configuration (suppliers, items, and seed) to a JSON file.
 
@@ -148,32 +241,146 @@ class DataGenerator:
             },
         }
 
-        with open(config_path, "w") as f:
-            json.dump(config_data, f, indent=4)
+        with open(config_path, "wb") as f:
+            f.write(
+                orjson.dumps(
+                    config_data,
+                    option=orjson.OPT_INDENT_2
+                    | orjson.OPT_NON_STR_KEYS
+                    | orjson.OPT_SERIALIZE_NUMPY,
+                )
+            )
 
         print(f"Simulation config exported to {config_path}")
 
-    def generate_all(self):
+    def generate_all(
+        self, cache_dir: str = "data"
+    ) -> tuple[
+        dict[int, Supplier],
+        dict[int, Item],
+        dict[int, Customer],
+        dict[int, np.ndarray],
+        dict[int, list[int]],
+        datetime,
+    ]:
         """
         Runs the full data generation process.
 
+        Results are cached on disk keyed on the seed and entity counts, so
+        repeated runs with the same configuration skip the Faker work and
+        load the previous output instead. Only the generated entities are
+        pickled; the derived mappings and sampling tables are rebuilt on
+        load so they always match the current code.
+
+        Args:
+            cache_dir (str): Directory for the pickle cache. Defaults to "data".
+
         Returns:
             tuple:
                 dict[int, Supplier]: All generated suppliers.
                 dict[int, Item]: All generated items.
                 dict[int, Customer]: All generated customers.
-                dict[int, list[int]]: Supplier-to-item mapping.
+                dict[int, np.ndarray]: Supplier-to-item mapping (int32 arrays).
+                dict[int, list[int]]: Item-to-supplier mapping.
                 datetime: Simulation start timestamp.
         """
-        used_categories = self.generate_suppliers()
-        self.generate_items(used_categories)
-        self.generate_customers()
-        self.map_supplier_items()
+        key = hashlib.md5(f"{self.seed}-{N_SUPPLIERS}-{N_ITEMS}-{N_CUSTOMERS}".encode()).hexdigest()
+        cache_path = os.path.join(cache_dir, f"cache_{key}.pkl")
+
+        if os.path.exists(cache_path):
+            with open(cache_path, "rb") as f:
+                (
+                    self.suppliers,
+                    self.items,
+                    self.customers,
+                    self.sim_epoch_ns,
+                ) = pickle.load(f)
+            self._build_derived()
+            print(f"Loaded generated data from cache {cache_path}")
+            return (
+                self.suppliers,
+                self.items,
+                self.customers,
+                self.supplier_items,
+                self.item_suppliers,
+                self.sim_time,
+            )
+
+        # Fused generation pass: suppliers, items, customers and the
+        # supplier-item buckets are built in one pipeline so each structure
+        # is touched while it is still hot instead of in separate sweeps.
+        categories = ["Electronics", "Clothing", "Food", "Medical", "Hardware"]
+        company = self.fake.company
+        supplier_failure_rates = self.nrng.uniform(0.01, 0.5, N_SUPPLIERS).round(2)
+        fulfillment_weights = self.nrng.uniform(0.1, 6.0, N_SUPPLIERS).round(2)
+
+        cat_to_sids = {}
+        for i in range(1, N_SUPPLIERS + 1):
+            category = categories[i % len(categories)]
+            cat_to_sids.setdefault(category, []).append(i)
+            self.suppliers[i] = Supplier(
+                id=i,
+                name=company(),
+                category=category,
+                max_quantity=40,
+                failure_rate=supplier_failure_rates[i - 1],
+                fulfillment_weight=fulfillment_weights[i - 1],
+            )
+
+        used_categories = list(cat_to_sids)
+        words = self.fake.words(nb=4 * N_ITEMS, unique=True)
+        names = list(dict.fromkeys(w.title() for w in words))[:N_ITEMS]
+        unit_prices = self.nrng.uniform(5.00, 50.00, N_ITEMS).round(2)
+        item_failure_rates = self.nrng.uniform(0.01, 0.5, N_ITEMS).round(2)
+        restock_weights = self.nrng.uniform(0.1, 6.0, N_ITEMS).round(2)
+
+        buckets = {sid: [] for sid in self.suppliers}
+        for i in range(1, N_ITEMS + 1):
+            category = self.rng.choice(used_categories)
+            self.items[i] = Item(
+                id=i,
+                name=names[i - 1],
+                category=category,
+                unit_price=unit_prices[i - 1],
+                failure_rate=item_failure_rates[i - 1],
+                restock_weight=restock_weights[i - 1],
+            )
+            sids = cat_to_sids[category]
+            self.item_suppliers[i] = list(sids)
+            for sid in sids:
+                buckets[sid].append(i)
+        self.supplier_items = {
+            sid: np.asarray(iids, dtype=np.int32) for sid, iids in buckets.items()
+        }
+
+        regions = ["North", "South", "East", "West"]
+        name = self.fake.name
+        for i in range(1, N_CUSTOMERS + 1):
+            self.customers[i] = Customer(
+                id=i, name=name(), region=self.rng.choice(regions)
+            )
+
+        self._build_sampling_tables(cat_to_sids)
         self.export_config()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_path, "wb") as f:
+            pickle.dump(
+                (
+                    self.suppliers,
+                    self.items,
+                    self.customers,
+                    self.sim_epoch_ns,
+                ),
+                f,
+                protocol=5,
+            )
+
         return (
             self.suppliers,
             self.items,
             self.customers,
             self.supplier_items,
+            self.item_suppliers,
             self.sim_time,
         )
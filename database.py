@@ -1,23 +1,47 @@
 """
 database.py
 
-This module provides a helper function to establish a connection to
+This module provides helper functions to obtain and release connections to
 the PostgreSQL database using configuration values defined in `config.py`.
 
+Connections are served from a shared `ThreadedConnectionPool`, so repeated
+`get_connection` calls reuse already-established connections instead of
+paying the TCP + authentication handshake each time.
+
 Typical usage example:
-    from database import get_connection
+    from database import get_connection, release_connection
 
     conn = get_connection()
     cur = conn.cursor()
+    ...
+    release_connection(conn)
 """
 
-import psycopg2
+import psycopg2.pool
 from config import DB_CONFIG
 
+_POOL = None
+
+
+def _get_pool():
+    """
+    Returns the shared connection pool, creating it on first use.
+
+    The pool is created lazily so importing this module does not require a
+    reachable database.
+
+    Returns:
+        psycopg2.pool.ThreadedConnectionPool: The shared connection pool.
+    """
+    global _POOL
+    if _POOL is None:
+        _POOL = psycopg2.pool.ThreadedConnectionPool(1, 8, **DB_CONFIG)
+    return _POOL
+
 
 def get_connection():
     """
-    Establishes and returns a connection to the PostgreSQL database.
+    Returns a connection to the PostgreSQL database from the shared pool.
 
     Uses the connection parameters defined in the DB_CONFIG dictionary from `config.py`.
 
@@ -28,4 +52,15 @@ def get_connection():
         psycopg2.OperationalError: If the connection fails due to invalid credentials,
                                    unreachable host, or other DB-related errors.
     """
-    return psycopg2.connect(**DB_CONFIG)
+    return _get_pool().getconn()
+
+
+def release_connection(conn):
+    """
+    Returns a connection to the shared pool for reuse.
+
+    Args:
+        conn (psycopg2.extensions.connection): A connection previously obtained
+                                               from `get_connection`.
+    """
+    _get_pool().putconn(conn)
@@ -5,6 +5,7 @@ This module provides functionality to populate the database with supplier, item,
 customer, and inventory data generated by the simulation.
 """
 
+import io
 import random
 
 
@@ -27,53 +28,49 @@ class SimulationDBLoader:
         self.conn = conn
         self.cur = conn.cursor()
 
-    def populate_tables(self, suppliers, items, customers, sim_time):
+    def populate_tables(self, generator):
         """
-        Populates the database tables with generated suppliers, items, customers, and inventory levels.
+        Populates the database tables with the generator's suppliers, items,
+        customers, and inventory levels.
+
+        Each table is loaded with a single COPY FROM STDIN over the
+        tab-separated rows produced by the generator, so the whole load is a
+        handful of round-trips instead of one INSERT per row.
 
         Args:
-            suppliers (dict[int, Supplier]): A dictionary of Supplier objects keyed by supplier ID.
-            items (dict[int, Item]): A dictionary of Item objects keyed by item ID.
-            customers (dict[int, Customer]): A dictionary of Customer objects keyed by customer ID.
-            sim_time (datetime): The simulated time used to set the inventory's `LAST_UPDATED` field.
+            generator (DataGenerator): The generator holding the data to load.
 
         Notes:
             - Inventory is initialised with a fixed quantity of 20 units per item-supplier pair
               where the supplier's category matches the item's category.
             - A random reorder point (0–10) is assigned per inventory entry.
         """
-        for customer in customers.values():
-            self.cur.execute(
-                "INSERT INTO CUSTOMERS (CUSTOMER_ID, NAME, REGION) VALUES (%s, %s, %s)",
-                (customer.id, customer.name, customer.region),
-            )
+        self.cur.copy_expert(
+            "COPY CUSTOMERS (CUSTOMER_ID, NAME, REGION) FROM STDIN",
+            io.StringIO(generator.customers_tsv()),
+        )
 
-        for supplier in suppliers.values():
-            self.cur.execute(
-                "INSERT INTO SUPPLIERS (SUPPLIER_ID, NAME, CATEGORY) VALUES (%s, %s, %s)",
-                (supplier.id, supplier.name, supplier.category),
-            )
+        self.cur.copy_expert(
+            "COPY SUPPLIERS (SUPPLIER_ID, NAME, CATEGORY) FROM STDIN",
+            io.StringIO(generator.suppliers_tsv()),
+        )
 
-        for item in items.values():
-            self.cur.execute(
-                "INSERT INTO ITEMS (ITEM_ID, NAME, CATEGORY, UNIT_PRICE) VALUES (%s, %s, %s, %s)",
-                (item.id, item.name, item.category, item.unit_price),
-            )
+        self.cur.copy_expert(
+            "COPY ITEMS (ITEM_ID, NAME, CATEGORY, UNIT_PRICE) FROM STDIN",
+            io.StringIO(generator.items_tsv()),
+        )
 
-        for supplier in suppliers.values():
-            for item in items.values():
-                if item.category == supplier.category:
-                    self.cur.execute(
-                        "INSERT INTO INVENTORY (ITEM_ID, SUPPLIER_ID, QUANTITY_ON_HAND, REORDER_POINT, LAST_UPDATED) "
-                        "VALUES (%s, %s, %s, %s, %s)",
-                        (
-                            item.id,
-                            supplier.id,
-                            20,
-                            random.randint(0, 10),
-                            sim_time.date(),
-                        ),
-                    )
+        load_date = generator.sim_time.date()
+        inventory_rows = "\n".join(
+            f"{item_id}\t{supplier_id}\t20\t{random.randint(0, 10)}\t{load_date}"
+            for supplier_id, item_ids in generator.supplier_items.items()
+            for item_id in item_ids
+        )
+        self.cur.copy_expert(
+            "COPY INVENTORY (ITEM_ID, SUPPLIER_ID, QUANTITY_ON_HAND, REORDER_POINT, LAST_UPDATED) "
+            "FROM STDIN",
+            io.StringIO(inventory_rows),
+        )
 
         self.conn.commit()
         print("✅ Database populated.")
@@ -16,7 +16,7 @@ Modules:
 """
 
 import time
-from database import get_connection
+from database import get_connection, release_connection
 from data_generator import DataGenerator
 from db_loader import SimulationDBLoader
 from simulation import Simulation
@@ -38,18 +38,20 @@ def main():
 
     # Step 1: Generate data
     generator = DataGenerator()
-    suppliers, items, customers, supplier_items, sim_time = generator.generate_all()
+    suppliers, items, customers, supplier_items, item_suppliers, sim_time = (
+        generator.generate_all()
+    )
 
     # Step 2: Load into database
     loader = SimulationDBLoader(conn)
-    loader.populate_tables(suppliers, items, customers, sim_time)
+    loader.populate_tables(generator)
 
     # Step 3: Run simulation
     sim = Simulation(conn, generator)
     sim.run(iterations=100000)
 
     # Step 4: Clean up
-    conn.close()
+    release_connection(conn)
     print(f"Simulation took {time.time() - start:.2f} seconds")
 
 
@@ -5,12 +5,16 @@ This module defines structured representations of core entities used in the simu
 - Supplier: Provides inventory and has limits, reliability, and priority.
 - Item: Product that can be ordered and restocked.
 - Customer: Entity that places orders within a specific region.
+- SupplierTable / ItemTable: Column-oriented (structure-of-arrays) views of the
+  entity collections for vectorized matching and sampling.
 """
 
 from dataclasses import dataclass
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Supplier:
     """Represents a supplier who provides inventory for one item category.
 
@@ -31,7 +35,7 @@ class Supplier:
     fulfillment_weight: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Item:
     """Represents an item that can be ordered by customers.
 
@@ -52,7 +56,7 @@ class Item:
     restock_weight: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Customer:
     """Represents a customer who places orders.
 
@@ -67,4 +71,62 @@ class Customer:
     region: str
 
 
-__all__ = ["Supplier", "Item", "Customer"]
+class SupplierTable:
+    """Column-oriented view of a supplier collection.
+
+    Stores one NumPy array per field so category matching and weighted
+    sampling can run as vectorized selections instead of per-object
+    attribute reads. The Supplier dataclasses remain the record-level API.
+
+    Attributes:
+        ids (np.ndarray): Supplier IDs.
+        categories (np.ndarray): Product category per supplier.
+        failure_rates (np.ndarray): Failure rate per supplier.
+        fulfillment_weights (np.ndarray): Fulfillment sampling weight per supplier.
+    """
+
+    def __init__(self, suppliers):
+        """
+        Builds the column arrays from an iterable of Supplier objects.
+
+        Args:
+            suppliers (Iterable[Supplier]): Suppliers to tabulate.
+        """
+        suppliers = list(suppliers)
+        self.ids = np.array([s.id for s in suppliers], dtype=np.int64)
+        self.categories = np.array([s.category for s in suppliers], dtype=object)
+        self.failure_rates = np.array(
+            [s.failure_rate for s in suppliers], dtype=np.float32
+        )
+        self.fulfillment_weights = np.array(
+            [s.fulfillment_weight for s in suppliers], dtype=np.float32
+        )
+
+
+class ItemTable:
+    """Column-oriented view of an item collection.
+
+    Attributes:
+        ids (np.ndarray): Item IDs.
+        categories (np.ndarray): Product category per item.
+        unit_prices (np.ndarray): Unit price per item.
+        failure_rates (np.ndarray): Failure rate per item.
+        restock_weights (np.ndarray): Restock sampling weight per item.
+    """
+
+    def __init__(self, items):
+        """
+        Builds the column arrays from an iterable of Item objects.
+
+        Args:
+            items (Iterable[Item]): Items to tabulate.
+        """
+        items = list(items)
+        self.ids = np.array([i.id for i in items], dtype=np.int64)
+        self.categories = np.array([i.category for i in items], dtype=object)
+        self.unit_prices = np.array([i.unit_price for i in items], dtype=np.float32)
+        self.failure_rates = np.array([i.failure_rate for i in items], dtype=np.float32)
+        self.restock_weights = np.array([i.restock_weight for i in items], dtype=np.float32)
+
+
+__all__ = ["Supplier", "Item", "Customer", "SupplierTable", "ItemTable"]
@@ -0,0 +1,20 @@
+"""
+setup.py
+
+Optional build script that ahead-of-time compiles the data-generation
+modules to native extensions with mypyc:
+
+    pip install mypy setuptools
+    python setup.py build_ext --inplace
+
+The compiled .so files are picked up automatically on import; the plain
+Python modules keep working when the extensions are absent.
+"""
+
+from setuptools import setup
+from mypyc.build import mypycify
+
+setup(
+    name="supply-chain-simulator",
+    ext_modules=mypycify(["models.py", "data_generator.py"]),
+)
@@ -13,10 +13,78 @@ Typical usage:
 """
 
 from datetime import timedelta
+import bisect
 import random
 from models import *
+from psycopg2.extras import execute_values
 import csv
 
+try:
+    from numba import njit
+except ImportError:  # Optional: kernels run as plain Python without numba.
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Status codes returned by _decide_status, mapped back to the SQL strings at
+# the call site so the kernel stays purely numeric.
+ORDER_STATUSES = ("expired", "partial - expired", "fulfilled", "unfulfilled", "partial")
+
+
+@njit(cache=True)
+def _decide_status(unfulfilled, fulfilled, total, is_expired):
+    """
+    Decides an order's status from its fulfillment counts and age.
+
+    Pure branch-on-integers kernel so numba can compile it when available;
+    exceptions and string handling deliberately stay outside.
+
+    Args:
+        unfulfilled (int): Number of order items with nothing fulfilled.
+        fulfilled (int): Number of order items completely fulfilled.
+        total (int): Total number of order items.
+        is_expired (bool): Whether the order has passed the 14-day cutoff.
+
+    Returns:
+        int: Index into ORDER_STATUSES.
+    """
+    if unfulfilled == total and is_expired:
+        return 0
+    elif is_expired:
+        return 1
+    elif fulfilled == total:
+        return 2
+    elif fulfilled == 0:
+        return 3
+    return 4
+
+
+# Column order for the streamed inventory-history rows.
+INVENTORY_LOG_COLUMNS = (
+    "timestamp",
+    "item_id",
+    "supplier_id",
+    "quantity_on_hand",
+    "backlog_unfulfilled_qty",
+)
+
+# Column order for fulfillment-log rows; kept in sync with the tuples built
+# in _attempt_fulfillment.
+FULFILLMENT_LOG_COLUMNS = (
+    "order_id",
+    "item_id",
+    "supplier_id",
+    "requested_qty",
+    "previously_fulfilled",
+    "newly_fulfilled",
+    "success",
+    "failure_reason",
+    "timestamp",
+)
+
 
 class Simulation:
     """
@@ -24,8 +92,8 @@ class Simulation:
 
     The simulation advances in small random time increments and randomly triggers
     events such as order creation, fulfillment attempts, inventory restocking, and
-    order expiration. The results are stored in memory and periodically exported
-    to CSV logs.
+    order expiration. The results are streamed to CSV logs as the run
+    progresses, with only a small buffer held between flush points.
 
     Attributes:
         conn (psycopg2.connection): Active database connection.
@@ -34,14 +102,21 @@ class Simulation:
         items (dict): Dictionary of Item instances keyed by ID.
         customers (dict): Dictionary of Customer instances keyed by ID.
         supplier_items (dict): Maps supplier IDs to lists of item IDs they provide.
+        item_suppliers (dict): Inverse mapping of item IDs to eligible supplier IDs.
         sim_time (datetime): Current simulation timestamp.
-        inventory_history (list): Log of inventory snapshots over time.
-        order_fulfillment_log (list): Log of fulfillment attempts.
-        recent_fulfillments (list): Temporary buffer for fulfillments until flush.
-        cached_unfulfilled_orders (list): List of unexpired, unfulfilled order IDs.
+        recent_fulfillments (list): Buffer of fulfillment rows awaiting the
+            next flush to the fulfillment CSV.
+        cached_unfulfilled_orders (list): List view of the open order IDs, rebuilt
+            lazily from the set when it goes stale.
     """
 
-    def __init__(self, conn, generator):
+    def __init__(
+        self,
+        conn,
+        generator,
+        inventory_filename="data\\inventory_history.csv",
+        fulfillment_filename="data\\fulfillment_log.csv",
+    ):
         """
         Initialises the Simulation with a database connection and data generator.
 
@@ -49,21 +124,228 @@ class Simulation:
             conn (psycopg2.connection): An active database connection object.
             generator (object): An object containing initial simulation data
                                 (suppliers, items, customers, etc.).
+            inventory_filename (str): Destination CSV for the inventory history.
+                                      Defaults to "data\inventory_history.csv".
+            fulfillment_filename (str): Destination CSV for the fulfillment log.
+                                        Defaults to "data\fulfillment_log.csv".
         """
         self.conn = conn
         self.cur = conn.cursor()
 
+        # Synthetic data: skip the WAL fsync wait on each commit window.
+        self.cur.execute("SET synchronous_commit = off")
+
         self.suppliers = generator.suppliers
         self.items = generator.items
         self.customers = generator.customers
         self.supplier_items = generator.supplier_items
-        self.sim_time = generator.sim_time
-
-        self.inventory_history = []
-        self.order_fulfillment_log = []
+        self.item_suppliers = generator.item_suppliers
+
+        # Simulation time is a fixed epoch plus an integer minute counter;
+        # datetime/date objects are only materialised on demand, and the
+        # derived date is cached until the counter crosses a day boundary.
+        self._epoch = generator.sim_time
+        self._minutes = 0
+        self._epoch_day_seconds = (
+            self._epoch.hour * 3600 + self._epoch.minute * 60 + self._epoch.second
+        )
+        self._cur_day = 0
+        self._cur_date = self._epoch.date()
+
+        # Entity dicts are static for the lifetime of a run, so the list
+        # views used for random sampling are materialised once.
+        self._items_list = list(self.items.values())
+        self._customers_list = list(self.customers.values())
+
+        # Log rows are streamed straight to their CSV files as they are
+        # produced instead of accumulating in memory for the whole run;
+        # recent_fulfillments only buffers rows until the next flush point.
+        self._inv_file = open(inventory_filename, "w", newline="")
+        self._inv_writer = csv.writer(self._inv_file)
+        self._inv_writer.writerow(INVENTORY_LOG_COLUMNS)
+        self._fulfillment_file = open(fulfillment_filename, "w", newline="")
+        self._fulfillment_writer = csv.writer(self._fulfillment_file)
+        self._fulfillment_writer.writerow(FULFILLMENT_LOG_COLUMNS)
         self.recent_fulfillments = []
+
+        # Open (unfulfilled/partial, unexpired) orders are tracked in-place:
+        # create_order adds, terminal status transitions remove, and the list
+        # view used for random.choice is rebuilt only when marked stale.
+        self._unfulfilled_set = set()
+        self._unfulfilled_stale = False
         self.cached_unfulfilled_orders = []
 
+        # Per-order [unfulfilled, fulfilled, total] item counts, maintained
+        # incrementally so a successful fulfillment can decide the new order
+        # status locally instead of re-aggregating ORDER_ITEMS in SQL.
+        self._order_counts = {}
+
+        self._restock_sql = self._build_restock_sql()
+        self._ensure_indexes()
+        self._prepare_statements()
+
+        # Event table for the run loop: names, handlers (None = idle) and
+        # cumulative weights, so each iteration is one random() draw and a
+        # bisect instead of a random.choices call rebuilding its prefix sums.
+        self._event_names = ("create_order", "fulfill_order", "restock", "idle")
+        self._event_dispatch = (
+            self.create_order,
+            self.fulfill_order,
+            self.restock_inventory,
+            None,
+        )
+        self._event_cum_weights = (0.2, 0.85, 0.95, 1.0)
+
+        # Combined supplier x item failure probability per eligible pair, so
+        # the hot fulfillment check is one dict lookup instead of two
+        # attribute chains and a multiply.
+        self._combined_failure = {
+            (sid, int(iid)): self.suppliers[sid].failure_rate
+            * self.items[int(iid)].failure_rate
+            for sid, iids in self.supplier_items.items()
+            for iid in iids
+        }
+
+    def _ensure_indexes(self):
+        """
+        Creates the indexes backing the hot query predicates if missing.
+
+        The partial indexes only cover "live" rows (open order items, open
+        orders), so they stay small while turning the per-event lookups from
+        sequential scans into index probes.
+        """
+        self.cur.execute(
+            """
+            CREATE INDEX IF NOT EXISTS IDX_ORDER_ITEMS_OPEN
+            ON ORDER_ITEMS (ORDER_ID)
+            WHERE FULFILLED_QUANTITY < QUANTITY
+            """
+        )
+        self.cur.execute(
+            """
+            CREATE INDEX IF NOT EXISTS IDX_INVENTORY_ITEM_SUPPLIER
+            ON INVENTORY (ITEM_ID, SUPPLIER_ID)
+            """
+        )
+        self.cur.execute(
+            """
+            CREATE INDEX IF NOT EXISTS IDX_ORDERS_OPEN_STATUS_DATE
+            ON ORDERS (ORDER_STATUS, ORDER_DATE)
+            WHERE ORDER_STATUS IN ('unfulfilled', 'partial')
+            """
+        )
+        self.conn.commit()
+
+    def _prepare_statements(self):
+        """
+        Prepares the per-event DML statements once on the session.
+
+        The hot statements (order insert, unfulfilled-item pick, inventory
+        decrement, fused order-item/status update) are parsed and planned a
+        single time with PREPARE; call sites then issue EXECUTE, skipping
+        the per-call parse and plan cost.
+        """
+        self.cur.execute(
+            """
+            PREPARE ins_order (int, timestamp, text) AS
+            INSERT INTO ORDERS (CUSTOMER_ID, ORDER_DATE, ORDER_STATUS)
+            VALUES ($1, $2, $3) RETURNING ORDER_ID
+            """
+        )
+        self.cur.execute(
+            """
+            PREPARE sel_unfulfilled_item (int) AS
+            SELECT ORDER_ITEM_ID, ITEM_ID, SUPPLIER_ID, QUANTITY, FULFILLED_QUANTITY
+            FROM ORDER_ITEMS
+            WHERE ORDER_ID = $1 AND FULFILLED_QUANTITY < QUANTITY
+            ORDER BY random()
+            LIMIT 1
+            """
+        )
+        self.cur.execute(
+            """
+            PREPARE upd_inventory (int, int, int, date) AS
+            WITH OLD AS (
+                SELECT ITEM_ID, SUPPLIER_ID, QUANTITY_ON_HAND
+                FROM INVENTORY
+                WHERE ITEM_ID = $1 AND SUPPLIER_ID = $2
+                FOR UPDATE
+            )
+            UPDATE INVENTORY INV
+            SET QUANTITY_ON_HAND = OLD.QUANTITY_ON_HAND
+                    - LEAST(OLD.QUANTITY_ON_HAND, $3),
+                LAST_UPDATED = CASE
+                    WHEN OLD.QUANTITY_ON_HAND > 0 THEN $4
+                    ELSE INV.LAST_UPDATED
+                END
+            FROM OLD
+            WHERE INV.ITEM_ID = OLD.ITEM_ID AND INV.SUPPLIER_ID = OLD.SUPPLIER_ID
+            RETURNING OLD.QUANTITY_ON_HAND AS AVAILABLE_QTY,
+                      LEAST(OLD.QUANTITY_ON_HAND, $3) AS FULFILL_QTY
+            """
+        )
+        self.cur.execute(
+            """
+            PREPARE upd_item_and_status (int, date, int, text, int) AS
+            WITH upd_item AS (
+                UPDATE ORDER_ITEMS
+                SET FULFILLED_QUANTITY = FULFILLED_QUANTITY + $1, FULFILLED_DATE = $2
+                WHERE ORDER_ITEM_ID = $3
+            )
+            UPDATE ORDERS SET ORDER_STATUS = $4 WHERE ORDER_ID = $5
+            """
+        )
+
+    def _build_restock_sql(self):
+        """
+        Builds the one-statement weighted restock query.
+
+        The item restock weights (and their pre-scaled restock amounts) and
+        supplier capacities are inlined as VALUES lists, so the statement can
+        pick a low-stock row server-side with weighted sampling
+        (ORDER BY -ln(random())/weight) and apply the clamped increment in
+        the same round-trip.
+
+        Returns:
+            str: The parameterised UPDATE statement (one %s for the date).
+        """
+        base_restock = 10
+        item_values = ",".join(
+            self.cur.mogrify(
+                "(%s, %s, %s)",
+                (
+                    item.id,
+                    float(item.restock_weight),
+                    int(base_restock * item.restock_weight),
+                ),
+            ).decode()
+            for item in self._items_list
+        )
+        supplier_values = ",".join(
+            self.cur.mogrify("(%s, %s)", (s.id, s.max_quantity)).decode()
+            for s in self.suppliers.values()
+        )
+        return f"""
+            WITH cand AS (
+                SELECT INV.ITEM_ID, INV.SUPPLIER_ID,
+                       LEAST(W.SCALED, S.MAX_QTY - INV.QUANTITY_ON_HAND) AS RESTOCK_AMOUNT
+                FROM INVENTORY INV
+                JOIN (VALUES {item_values}) AS W (ITEM_ID, WEIGHT, SCALED)
+                  ON W.ITEM_ID = INV.ITEM_ID
+                JOIN (VALUES {supplier_values}) AS S (SUPPLIER_ID, MAX_QTY)
+                  ON S.SUPPLIER_ID = INV.SUPPLIER_ID
+                WHERE INV.QUANTITY_ON_HAND <= INV.REORDER_POINT
+                ORDER BY -ln(random()) / W.WEIGHT
+                LIMIT 1
+            )
+            UPDATE INVENTORY INV
+            SET QUANTITY_ON_HAND = INV.QUANTITY_ON_HAND + CAND.RESTOCK_AMOUNT,
+                LAST_UPDATED = %s
+            FROM cand CAND
+            WHERE INV.ITEM_ID = CAND.ITEM_ID
+              AND INV.SUPPLIER_ID = CAND.SUPPLIER_ID
+            """
+
     def query_one(self, sql, params=()):
         """
         Executes a SQL query and returns the first row of the result.
@@ -102,11 +384,31 @@ class Simulation:
         """
         self.cur.execute(sql, params)
 
+    @property
+    def sim_time(self):
+        """
+        datetime: The current simulation timestamp, derived from the epoch
+        and the elapsed minute counter.
+        """
+        return self._epoch + timedelta(minutes=self._minutes)
+
+    @property
+    def sim_date(self):
+        """
+        datetime.date: The current simulation date, recomputed only when the
+        minute counter crosses a day boundary.
+        """
+        day = (self._epoch_day_seconds + self._minutes * 60) // 86400
+        if day != self._cur_day:
+            self._cur_day = day
+            self._cur_date = self.sim_time.date()
+        return self._cur_date
+
     def increment_time(self):
         """
         Increments the simulation time by a random number of minutes.
         """
-        self.sim_time += timedelta(minutes=random.randint(1, 10))
+        self._minutes += random.randint(1, 10)
 
     def create_order(self):
         """
@@ -116,29 +418,39 @@ class Simulation:
         order items to the 'ORDER_ITEMS' table, associating them with
         eligible suppliers.
         """
-        customer = random.choice(list(self.customers.values()))
+        customer = random.choice(self._customers_list)
         self.cur.execute(
-            "INSERT INTO ORDERS (CUSTOMER_ID, ORDER_DATE, ORDER_STATUS) VALUES (%s, %s, %s) RETURNING ORDER_ID",
+            "EXECUTE ins_order (%s, %s, %s)",
             (customer.id, self.sim_time, "unfulfilled"),
         )
         order_id = self.cur.fetchone()[0]
 
-        for item in random.sample(list(self.items.values()), k=random.randint(1, 5)):
-            eligible_suppliers = [
-                sid for sid, items in self.supplier_items.items() if item.id in items
-            ]
+        rows = []
+        for item in random.sample(self._items_list, k=random.randint(1, 5)):
+            eligible_suppliers = self.item_suppliers.get(item.id, ())
 
             if not eligible_suppliers:
                 continue
 
             supplier_id = random.choice(eligible_suppliers)
+            rows.append((order_id, item.id, supplier_id, random.randint(1, 5), 0))
 
-            self.cur.execute(
+        if rows:
+            execute_values(
+                self.cur,
                 "INSERT INTO ORDER_ITEMS (ORDER_ID, ITEM_ID, SUPPLIER_ID, QUANTITY, FULFILLED_QUANTITY, FULFILLED_DATE) "
-                "VALUES (%s, %s, %s, %s, %s, NULL)",
-                (order_id, item.id, supplier_id, random.randint(1, 5), 0),
+                "VALUES %s",
+                rows,
+                template="(%s, %s, %s, %s, %s, NULL)",
             )
 
+        # The caches are registered last: if the item insert raises, the
+        # savepoint in run() removes the order from the DB, and the id must
+        # not linger in the open-order set with no matching rows or counters.
+        self._order_counts[order_id] = [len(rows), 0, len(rows)]
+        self._unfulfilled_set.add(order_id)
+        self.cached_unfulfilled_orders.append(order_id)
+
     def fulfill_order(self):
         """
         Attempts to fulfill a random unfulfilled order item.
@@ -165,146 +477,73 @@ class Simulation:
 
     def restock_inventory(self):
         """
-        Restocks inventory for items that are below their reorder point.
+        Restocks inventory for an item that is below its reorder point.
 
-        Queries for items with low stock and randomly selects one based on
-        item restock weights. It then calculates a restock amount and updates
-        the inventory quantity.
+        Executes the prebuilt one-statement restock query, which picks a
+        low-stock row server-side weighted by item restock weight and
+        applies the capacity-clamped increment in the same round-trip. A
+        no-op when nothing is below its reorder point.
         """
-        self.cur.execute(
-            """
-            SELECT ITEM_ID, SUPPLIER_ID
-            FROM INVENTORY
-            WHERE QUANTITY_ON_HAND <= REORDER_POINT
-            """
-        )
-        low_stock = self.cur.fetchall()
-
-        if low_stock:
-            item_ids = [item_id for item_id, _ in low_stock]
-            weights = [self.items[item_id].restock_weight for item_id in item_ids]
-
-            chosen_index = random.choices(range(len(low_stock)), weights=weights, k=1)[
-                0
-            ]
-            item_id, supplier_id = low_stock[chosen_index]
-
-            item = self.items[item_id]
-            supplier = self.suppliers[supplier_id]
-            max_qty = supplier.max_quantity
-
-            self.cur.execute(
-                """
-                SELECT QUANTITY_ON_HAND
-                FROM INVENTORY
-                WHERE ITEM_ID = %s AND SUPPLIER_ID = %s
-                """,
-                (item_id, supplier_id),
-            )
-            current_qty = self.cur.fetchone()[0]
-
-            base_restock = 10
-            scaled = int(base_restock * item.restock_weight)
-            restock_amount = min(scaled, max_qty - current_qty)
-
-            self.cur.execute(
-                """
-                UPDATE INVENTORY
-                SET QUANTITY_ON_HAND = QUANTITY_ON_HAND + %s,
-                    LAST_UPDATED = %s
-                WHERE ITEM_ID = %s AND SUPPLIER_ID = %s
-                """,
-                (restock_amount, self.sim_time.date(), item_id, supplier_id),
-            )
-        else:
-            pass  # No items to restock
+        self.cur.execute(self._restock_sql, (self.sim_date,))
 
     def expire_old_orders(self):
         """
         Identifies and updates the status of old unfulfilled or partially fulfilled orders to 'expired'.
 
-        Orders older than 14 days with 'unfulfilled' or 'partial' status are marked as expired.
+        Orders older than 14 days with 'unfulfilled' or 'partial' status are marked
+        as expired ('partial - expired' when any item was partially fulfilled) in a
+        single UPDATE that aggregates ORDER_ITEMS server-side, instead of one
+        aggregate query plus UPDATE per stale order.
         """
         self.cur.execute(
             """
-            SELECT ORDER_ID, ORDER_DATE
-            FROM ORDERS
-            WHERE ORDER_STATUS IN ('unfulfilled', 'partial')
-            AND ORDER_DATE <= %s
+            UPDATE ORDERS O
+            SET ORDER_STATUS = CASE
+                    WHEN AGG.UNFULFILLED = AGG.TOTAL THEN 'expired'
+                    ELSE 'partial - expired'
+                END
+            FROM (
+                SELECT ORDER_ID,
+                       SUM(CASE WHEN FULFILLED_QUANTITY = 0 THEN 1 ELSE 0 END) AS UNFULFILLED,
+                       COUNT(*) AS TOTAL
+                FROM ORDER_ITEMS
+                GROUP BY ORDER_ID
+            ) AGG
+            WHERE O.ORDER_ID = AGG.ORDER_ID
+            AND O.ORDER_STATUS IN ('unfulfilled', 'partial')
+            AND O.ORDER_DATE <= %s
+            RETURNING O.ORDER_ID
             """,
-            (self.sim_time.date() - timedelta(days=14),),
+            (self.sim_date - timedelta(days=14),),
         )
+        for (order_id,) in self.cur.fetchall():
+            self._discard_unfulfilled(order_id)
 
-        rows = self.cur.fetchall()
-
-        for order_id, order_date in rows:
-            self.update_order_status(order_id, order_date)
-
-    def update_order_status(self, order_id, order_date):
+    def _discard_unfulfilled(self, order_id):
         """
-        Updates the status of a specific order based on its fulfillment progress and age.
+        Removes an order from the open-order cache after a terminal transition.
 
         Args:
-            order_id (int): The ID of the order to update.
-            order_date (datetime.date): The creation date of the order.
-        """
-        unfulfilled, fulfilled, total = self.query_one(
-            """
-            SELECT
-                SUM(CASE WHEN FULFILLED_QUANTITY = 0 THEN 1 ELSE 0 END) AS unfulfilled,
-                SUM(CASE WHEN FULFILLED_QUANTITY = QUANTITY THEN 1 ELSE 0 END) AS fulfilled,
-                COUNT(*) AS total
-            FROM ORDER_ITEMS
-            WHERE ORDER_ID = %s
-            """,
-            (order_id,),
-        )
-
-        is_expired = (self.sim_time.date() - order_date).days >= 14
-
-        if unfulfilled == total and is_expired:
-            status = "expired"
-        elif is_expired:
-            status = "partial - expired"
-        elif fulfilled == total:
-            status = "fulfilled"
-        elif fulfilled == 0:
-            status = "unfulfilled"
-        else:
-            status = "partial"
-
-        self.cur.execute(
-            "UPDATE ORDERS SET ORDER_STATUS = %s WHERE ORDER_ID = %s",
-            (status, order_id),
-        )
-
-    def update_cached_unfulfilled_orders(self):
-        """
-        Refreshes the internal cache of unfulfilled or partially fulfilled order IDs.
-
-        This method queries the database for all orders that are currently
-        'partial' or 'unfulfilled' and are not yet expired (within 14 days
-        of their order date), storing their IDs in
-        `self.cached_unfulfilled_orders` for quick access.
+            order_id (int): The ID of the order that is no longer open.
         """
-        rows = self.query_all(
-            """
-            SELECT ORDER_ID
-            FROM ORDERS
-            WHERE ORDER_STATUS IN ('partial', 'unfulfilled')
-            AND ORDER_DATE >= %s
-        """,
-            (self.sim_time - timedelta(days=14),),
-        )
-        self.cached_unfulfilled_orders = [row[0] for row in rows]
+        if order_id in self._unfulfilled_set:
+            self._unfulfilled_set.discard(order_id)
+            self._unfulfilled_stale = True
+            self._order_counts.pop(order_id, None)
 
     def _select_random_unfulfilled_order(self):
         """
         Selects a random unfulfilled or partially fulfilled order ID from the cache.
 
+        Rebuilds the list view from the tracking set first if terminal
+        transitions have made it stale.
+
         Returns:
             int or None: The ID of a random unfulfilled order, or None if no such orders exist.
         """
+        if self._unfulfilled_stale:
+            self.cached_unfulfilled_orders = list(self._unfulfilled_set)
+            self._unfulfilled_stale = False
         if not self.cached_unfulfilled_orders:
             return None
         return random.choice(self.cached_unfulfilled_orders)
@@ -313,6 +552,10 @@ class Simulation:
         """
         Retrieves a random unfulfilled item within a given order.
 
+        The uniform pick happens server-side via ORDER BY random() LIMIT 1
+        (prepared as sel_unfulfilled_item), so only the chosen row crosses
+        the wire.
+
         Args:
             order_id (int): The ID of the order to search within.
 
@@ -321,18 +564,7 @@ class Simulation:
                            for a randomly selected unfulfilled item, or None if no such items exist.
         """
 
-        candidates = self.query_all(
-            """
-            SELECT ORDER_ITEM_ID, ITEM_ID, SUPPLIER_ID, QUANTITY, FULFILLED_QUANTITY
-            FROM ORDER_ITEMS
-            WHERE ORDER_ID = %s AND FULFILLED_QUANTITY < QUANTITY
-        """,
-            (order_id,),
-        )
-
-        if not candidates:
-            return None
-        return random.choice(candidates)
+        return self.query_one("EXECUTE sel_unfulfilled_item (%s)", (order_id,))
 
     def _attempt_fulfillment(
         self,
@@ -346,9 +578,12 @@ class Simulation:
         """
         Attempts to fulfill a specific order item.
 
-        Checks for supplier reliability and available inventory. If successful,
-        it updates inventory and order item fulfillment quantities, then
-        updates the overall order status. Logs the outcome of the attempt.
+        Checks for supplier reliability, then decrements inventory with a
+        single conditional UPDATE ... RETURNING that reads the available
+        quantity and applies the clamped decrement atomically. On success it
+        adjusts the in-memory per-order counters and writes the fulfillment
+        quantities and locally decided order status in one fused statement.
+        Logs the outcome of the attempt.
 
         Args:
             order_id (int): The ID of the parent order.
@@ -359,140 +594,113 @@ class Simulation:
             fulfilled_quantity (int): The quantity already fulfilled for this order item.
 
         Returns:
-            dict: A dictionary containing details of the fulfillment attempt,
-                  including success status, quantity fulfilled, and any failure reason.
+            tuple: A row in FULFILLMENT_LOG_COLUMNS order describing the
+                   attempt, including success status, quantity fulfilled, and
+                   any failure reason.
         """
-        item = self.items.get(item_id)
-        supplier = self.suppliers.get(supplier_id)
-
         timestamp = self.sim_time.isoformat()
         remaining_qty = quantity - fulfilled_quantity
 
-        result_data = {
-            "order_id": order_id,
-            "item_id": item_id,
-            "supplier_id": supplier_id,
-            "requested_qty": quantity,
-            "previously_fulfilled": fulfilled_quantity,
-            "newly_fulfilled": 0,
-            "success": False,
-            "failure_reason": None,
-            "timestamp": timestamp,
-        }
+        def log_row(newly_fulfilled=0, success=False, failure_reason=None):
+            return (
+                order_id,
+                item_id,
+                supplier_id,
+                quantity,
+                fulfilled_quantity,
+                newly_fulfilled,
+                success,
+                failure_reason,
+                timestamp,
+            )
 
-        if random.random() < supplier.failure_rate * item.failure_rate:
-            result_data["failure_reason"] = "unreliable_supplier"
-            return result_data
+        if random.random() < self._combined_failure[(supplier_id, item_id)]:
+            return log_row(failure_reason="unreliable_supplier")
 
         result = self.query_one(
-            """
-            SELECT QUANTITY_ON_HAND
-            FROM INVENTORY
-            WHERE ITEM_ID = %s AND SUPPLIER_ID = %s
-        """,
-            (item_id, supplier_id),
+            "EXECUTE upd_inventory (%s, %s, %s, %s)",
+            (item_id, supplier_id, remaining_qty, self.sim_date),
         )
 
         if not result:
-            result_data["failure_reason"] = "no_inventory_entry"
-            return result_data
+            return log_row(failure_reason="no_inventory_entry")
 
-        available_qty = result[0]
+        available_qty, fulfill_qty = result
         if available_qty == 0:
-            result_data["failure_reason"] = "stockout"
-            return result_data
+            return log_row(failure_reason="stockout")
 
-        fulfill_qty = min(available_qty, remaining_qty)
-
-        self.cur.execute(
-            "UPDATE INVENTORY SET QUANTITY_ON_HAND = QUANTITY_ON_HAND - %s, LAST_UPDATED = %s "
-            "WHERE ITEM_ID = %s AND SUPPLIER_ID = %s",
-            (fulfill_qty, self.sim_time.date(), item_id, supplier_id),
+        counts = self._order_counts[order_id]
+        new_unfulfilled = counts[0] - (1 if fulfilled_quantity == 0 else 0)
+        new_fulfilled = counts[1] + (
+            1 if fulfilled_quantity + fulfill_qty == quantity else 0
         )
+        status = ORDER_STATUSES[
+            _decide_status(new_unfulfilled, new_fulfilled, counts[2], False)
+        ]
 
         self.cur.execute(
-            "UPDATE ORDER_ITEMS SET FULFILLED_QUANTITY = FULFILLED_QUANTITY + %s, FULFILLED_DATE = %s "
-            "WHERE ORDER_ITEM_ID = %s",
-            (fulfill_qty, self.sim_time.date(), order_item_id),
+            "EXECUTE upd_item_and_status (%s, %s, %s, %s, %s)",
+            (fulfill_qty, self.sim_date, order_item_id, status, order_id),
         )
 
-        self.update_order_status(order_id, self.sim_time.date())
+        # The counters and open-order cache are only touched once the fused
+        # update has succeeded; if it raises, the savepoint in run() rolls the
+        # DB back and the Python-side state must still match it.
+        counts[0] = new_unfulfilled
+        counts[1] = new_fulfilled
+        if status not in ("unfulfilled", "partial"):
+            self._discard_unfulfilled(order_id)
 
-        result_data.update(
-            {
-                "newly_fulfilled": fulfill_qty,
-                "success": True,
-            }
-        )
-        return result_data
+        return log_row(newly_fulfilled=fulfill_qty, success=True)
 
     def log_inventory_snapshot(self):
         """
         Records the current state of inventory and relevant metrics.
 
         Takes a snapshot of all inventory items, including quantity on hand,
-        and unfulfilled backlog quantities, and appends it to the `inventory_history` log.
-        """
-        self.cur.execute(
-            """
-            SELECT ITEM_ID, SUPPLIER_ID, QUANTITY_ON_HAND
-            FROM INVENTORY
-            """
-        )
-        for item_id, supplier_id, qty in self.cur.fetchall():
-            self.cur.execute(
+        and unfulfilled backlog quantities, and streams it to the inventory
+        history CSV. The backlog per (item, supplier) pair is aggregated in a
+        single LEFT JOIN query instead of one subquery per inventory row, and
+        the result set is iterated through a named server-side cursor so the
+        rows flow straight to the CSV without being buffered client-side.
+        """
+        with self.conn.cursor(name="inv_snap") as snap_cur:
+            snap_cur.itersize = 2000
+            snap_cur.execute(
+                """
+                SELECT INV.ITEM_ID, INV.SUPPLIER_ID, INV.QUANTITY_ON_HAND,
+                       COALESCE(SUM(OI.QUANTITY - OI.FULFILLED_QUANTITY), 0)
+                FROM INVENTORY INV
+                LEFT JOIN ORDER_ITEMS OI
+                  ON OI.ITEM_ID = INV.ITEM_ID
+                 AND OI.SUPPLIER_ID = INV.SUPPLIER_ID
+                 AND OI.FULFILLED_QUANTITY < OI.QUANTITY
+                GROUP BY INV.ITEM_ID, INV.SUPPLIER_ID, INV.QUANTITY_ON_HAND
                 """
-                SELECT SUM(QUANTITY - FULFILLED_QUANTITY)
-                FROM ORDER_ITEMS
-                WHERE ITEM_ID = %s AND SUPPLIER_ID = %s AND FULFILLED_QUANTITY < QUANTITY
-                """,
-                (item_id, supplier_id),
-            )
-            unfulfilled_units = self.cur.fetchone()[0] or 0
-
-            self.inventory_history.append(
-                {
-                    "timestamp": self.sim_time.isoformat(),
-                    "item_id": item_id,
-                    "supplier_id": supplier_id,
-                    "quantity_on_hand": qty,
-                    "backlog_unfulfilled_qty": unfulfilled_units,
-                }
             )
+            timestamp = self.sim_time.isoformat()
+            self._inv_writer.writerows((timestamp,) + row for row in snap_cur)
 
-    def export_logs(
-        self,
-        inventory_filename="data\\inventory_history.csv",
-        fulfillment_filename="data\\fulfillment_log.csv",
-    ):
+    def _flush_fulfillments(self):
+        """
+        Writes the buffered fulfillment rows to the fulfillment CSV.
         """
-        Exports the collected inventory history and order fulfillment logs to CSV files.
+        if self.recent_fulfillments:
+            self._fulfillment_writer.writerows(self.recent_fulfillments)
+            self.recent_fulfillments.clear()
 
-        Args:
-            inventory_filename (str): The filename for the inventory history CSV.
-                                      Defaults to "data\inventory_history.csv".
-            fulfillment_filename (str): The filename for the fulfillment log CSV.
-                                        Defaults to "data\fulfillment_log.csv".
+    def export_logs(self):
         """
-        if self.inventory_history:
-            with open(inventory_filename, "w", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=self.inventory_history[0].keys())
-                writer.writeheader()
-                writer.writerows(self.inventory_history)
-            print(f"📁 Inventory history exported to {inventory_filename}")
-        else:
-            print("⚠️ No inventory history to export.")
-
-        if self.order_fulfillment_log:
-            with open(fulfillment_filename, "w", newline="") as f:
-                writer = csv.DictWriter(
-                    f, fieldnames=self.order_fulfillment_log[0].keys()
-                )
-                writer.writeheader()
-                writer.writerows(self.order_fulfillment_log)
-            print(f"📁 Fulfillment log exported to {fulfillment_filename}")
-        else:
-            print("⚠️ No fulfillment log to export.")
+        Finalises the CSV logs streamed during the run.
+
+        Rows are written incrementally at each flush point, so this only
+        drains the remaining fulfillment buffer and closes the file handles.
+        """
+        self._flush_fulfillments()
+        self._inv_file.close()
+        self._fulfillment_file.close()
+        print(f"📁 Inventory history exported to {self._inv_file.name}")
+        print(f"📁 Fulfillment log exported to {self._fulfillment_file.name}")
 
     def run(self, iterations=100):
         """
@@ -506,46 +714,42 @@ class Simulation:
             - idle
 
         Every 100 iterations, inventory snapshots and fulfillment logs are flushed
-        to memory, and expired orders are updated. Logs are exported at the end.
+        to their CSV files, and expired orders are updated.
 
         Args:
             iterations (int): Number of simulation steps to run. Defaults to 100.
         """
 
         print(
-            f"🚀 Starting simulation at {self.sim_time.date()} with {iterations} steps..."
+            f"🚀 Starting simulation at {self.sim_date} with {iterations} steps..."
         )
 
         for i in range(1, iterations):
             self.increment_time()
 
             if i % 100 == 0:
-                self.update_cached_unfulfilled_orders()
                 self.expire_old_orders()
-                self.order_fulfillment_log.extend(self.recent_fulfillments)
-                self.recent_fulfillments = []
+                self._flush_fulfillments()
                 self.log_inventory_snapshot()
                 self.conn.commit()
 
-            event = random.choices(
-                ["create_order", "fulfill_order", "restock", "idle"],
-                weights=[0.2, 0.65, 0.1, 0.05],
-            )[0]
+            idx = bisect.bisect_left(self._event_cum_weights, random.random())
+            event_fn = self._event_dispatch[idx]
+            if event_fn is None:
+                continue
 
+            # Each event runs inside a savepoint so a failure rolls back only
+            # that event instead of poisoning the whole 100-iteration window.
+            self.cur.execute("SAVEPOINT ev")
             try:
-                if event == "create_order":
-                    self.create_order()
-                elif event == "fulfill_order":
-                    self.fulfill_order()
-                elif event == "restock":
-                    self.restock_inventory()
+                event_fn()
             except Exception as e:
-                print(f"❌ Error during {event}: {e}")
+                self.cur.execute("ROLLBACK TO SAVEPOINT ev")
+                print(f"❌ Error during {self._event_names[idx]}: {e}")
+            else:
+                self.cur.execute("RELEASE SAVEPOINT ev")
 
         self.conn.commit()
-        print(f"✅ Simulation completed at {self.sim_time.date()}.")
-
-        self.order_fulfillment_log.extend(self.recent_fulfillments)
-        self.recent_fulfillments.clear()
+        print(f"✅ Simulation completed at {self.sim_date}.")
 
         self.export_logs()